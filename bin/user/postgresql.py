@@ -17,15 +17,43 @@ Variables:
   autocommit: whether to automatically commit transactions (default True)
   real_as_double: whether to convert REAL columns to DOUBLE PRECISION (default True)
   maintenance_db: the name of the database to use for maintenance operations (default 'postgres')
+  plan_cache_mode: if set, the value of the PostgreSQL setting plan_cache_mode ('auto',
+    'force_generic_plan', or 'force_custom_plan') for the session. Default is empty string, which
+    leaves the server's setting alone.
+  pool_size: if greater than zero, connections are taken from a pool holding at most this many
+    connections, rather than opened anew by every connect(). Requires the optional package
+    psycopg_pool. Default is 0, which turns pooling off.
 """
 
+import contextlib
+import functools
 import re
+import threading
 
 # Require psycopg (v3)
 import psycopg
 from psycopg import DatabaseError as PGDatabaseError
 from psycopg import InterfaceError as PGInterfaceError
-from psycopg.types.numeric import FloatLoader
+from psycopg import sql
+from psycopg.conninfo import make_conninfo
+from psycopg.pq import Format, TransactionStatus
+from psycopg.types.numeric import FloatLoader, NumericBinaryLoader
+
+# Connection pooling is optional. Without psycopg_pool, every connect() opens a new connection,
+# whatever pool_size says.
+try:
+    from psycopg_pool import ConnectionPool, PoolClosed, PoolTimeout
+except ImportError:
+    ConnectionPool = None
+    _POOL_ERRORS = ()
+    _POOL_CHECK = {}
+else:
+    # Errors a pool raises instead of a connection error, such as when the server is down
+    _POOL_ERRORS = (PoolClosed, PoolTimeout)
+    # Checking idle connections before handing them out is new in psycopg_pool 3.2. Older versions
+    # go without.
+    _POOL_CHECK = ({'check': ConnectionPool.check_connection}
+                   if hasattr(ConnectionPool, 'check_connection') else {})
 
 import weedb
 from weeutil.weeutil import to_bool, version_compare
@@ -34,9 +62,16 @@ import weewx
 if version_compare(weewx.__version__, '5.3.0') < 0:
     raise ImportError("WeeWX version 5.3.0 or higher is required for the PostgreSQL driver")
 
-# This tells psycopg3 to return float instead of decimal.Decimal.
-# OID 1700 is the standard internal ID for NUMERIC in PostgreSQL
-psycopg.adapters.register_loader(1700, FloatLoader)
+
+class _FloatBinaryLoader(NumericBinaryLoader):
+    """Load NUMERIC values sent in binary format as float, rather than decimal.Decimal."""
+
+    def load(self, data):
+        return float(super().load(data))
+
+
+# Number of rows to retrieve per round-trip when scanning catalog and metadata results
+_ARRAYSIZE = 256
 
 # Map SQLSTATE error codes to weedb exceptions
 _exception_map = {
@@ -53,42 +88,122 @@ _exception_map = {
     '08003': weedb.DisconnectError,       # connection_does_not_exist
     None: weedb.DatabaseError,
 }
+_exception_map_get = _exception_map.get
+
+# Pattern for the message of a non-existent database
+_NO_DATABASE_RE = re.compile(r'database "[^"]*" does not exist')
+
+# Number of rows a server-side cursor fetches per round-trip
+_ITERSIZE = 1000
+
+# Matches a type modifier, such as the "(30)" in "character varying(30)"
+_TYPMOD_RE = re.compile(r'\([^)]*\)')
+
+# weedb column types of the PostgreSQL types that cannot be recognized by a substring
+_COLUMN_TYPES = {
+    'DOUBLE PRECISION': 'REAL',
+    'REAL': 'REAL',
+    'NUMERIC': 'REAL',
+    'DECIMAL': 'REAL',
+    'TEXT': 'STR',
+}
+
+# Number of executions after which psycopg prepares a statement on the server. WeeWX repeats the
+# same handful of queries over and over, so prepare them on their second use.
+_PREPARE_THRESHOLD = 1
+
+# Statements on the metadata table. They are defined once, so psycopg sees the same string each
+# time, and are prepared on the server at their first use.
+_SQL_SELECT_TABLES = "SELECT DISTINCT table_name FROM weewx_db__metadata;"
+_SQL_SELECT_COLUMNS = "SELECT column_name FROM weewx_db__metadata WHERE table_name = %s;"
+_SQL_INSERT_COLUMN = "INSERT INTO weewx_db__metadata (table_name, column_name) VALUES (%s, %s);"
+_SQL_DELETE_TABLE = "DELETE FROM weewx_db__metadata WHERE table_name = %s;"
+_SQL_DELETE_COLUMNS = ("DELETE FROM weewx_db__metadata "
+                       "WHERE table_name = %s AND column_name = ANY (%s);")
+_SQL_RENAME_COLUMN = ("UPDATE weewx_db__metadata SET column_name = %s "
+                      "WHERE table_name = %s AND column_name = %s;")
+
+# Options that belong to this driver, rather than to libpq
+_DRIVER_OPTIONS = ('driver', 'autocommit', 'real_as_double', 'maintenance_db', 'pool_size')
+
+# Process-wide connection pools, keyed by (conninfo, autocommit)
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _weedb_error(e):
+    """Return the weedb exception that corresponds to the psycopg exception e."""
+    if isinstance(e, PGInterfaceError):
+        return weedb.DisconnectError(e)
+    # A pool that cannot hand out a connection raises an error without an SQLSTATE. Report it as
+    # a failure to connect, so WeeWX will try again.
+    if isinstance(e, _POOL_ERRORS):
+        return weedb.CannotConnectError(e)
+    # Look for a specific SQLSTATE code. Almost all errors have one.
+    sqlstate = getattr(e, 'sqlstate', None)
+    if sqlstate:
+        return _exception_map_get(sqlstate, weedb.DatabaseError)(e)
+    # No SQLSTATE. Try to decipher the error from the message.
+    msg = str(e)
+    if "failed to resolve host" in msg:
+        klass = weedb.CannotConnectError
+    elif "password authentication failed" in msg:
+        klass = weedb.BadPasswordError
+    elif _NO_DATABASE_RE.search(msg):
+        klass = weedb.NoDatabaseError
+    else:
+        # Default to DatabaseError
+        klass = weedb.DatabaseError
+    return klass(e)
+
+
+class _PGGuard:
+    """Context manager converting psycopg exceptions raised inside it into weedb exceptions. It
+    holds no state, so the single instance _pg_errors can be shared."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, etyp, einst, etb):
+        if isinstance(einst, (PGDatabaseError, PGInterfaceError)):
+            raise _weedb_error(einst)
+        return False
+
+
+_pg_errors = _PGGuard()
 
 
 def _pg_guard(fn):
     """Decorator converting psycopg exceptions into weedb exceptions."""
 
+    @functools.wraps(fn)
     def guarded_fn(*args, **kwargs):
-        try:
+        with _pg_errors:
             return fn(*args, **kwargs)
-        except PGDatabaseError as e:
-            # Look for a specific SQLSTATE code. If not found, then try to
-            # decipher from the error message
-            sqlstate = getattr(e, 'sqlstate', None)
-            if sqlstate:
-                klass = _exception_map.get(sqlstate, weedb.DatabaseError)
-            elif "failed to resolve host" in str(e):
-                klass = weedb.CannotConnectError
-            elif "password authentication failed" in str(e):
-                klass = weedb.BadPasswordError
-            # Pattern for a non-existent database
-            elif re.search(r'database "[^"]*" does not exist', str(e)):
-                klass = weedb.NoDatabaseError
-            else:
-                # Default to DatabaseError
-                klass = weedb.DatabaseError
-            raise klass(e)
-        except PGInterfaceError as e:
-            raise weedb.DisconnectError(e)
 
     return guarded_fn
 
 
-@_pg_guard
-def connect(host='localhost', user='', password='', database_name='',
-            driver='', port=5432, autocommit=True, real_as_double=True, **kwargs):
-    """Connect to the specified PostgreSQL database."""
-    conn = psycopg.connect(
+def _configure(conn):
+    """Set up a newly opened psycopg connection. Called once per connection, including those
+    opened by a connection pool."""
+    # This tells psycopg3 to return float instead of decimal.Decimal, for both text and binary
+    # results. OID 1700 is the standard internal ID for NUMERIC in PostgreSQL. WeeWX does not
+    # store NUMERIC values, but SUM() and AVG() over INTEGER columns return them.
+    conn.adapters.register_loader(1700, FloatLoader)
+    conn.adapters.register_loader(1700, _FloatBinaryLoader)
+    conn.prepare_threshold = _PREPARE_THRESHOLD
+
+
+def _conninfo(host, user, password, database_name, port, plan_cache_mode='', **kwargs):
+    """Return the libpq connection string for the database described by the given options. Those
+    in kwargs that belong to this driver are left out; the rest are passed on to libpq."""
+    for option in _DRIVER_OPTIONS:
+        kwargs.pop(option, None)
+    if plan_cache_mode:
+        # Pass the setting in the startup packet, which saves sending a separate SET statement.
+        kwargs['options'] = f"{kwargs.get('options', '')} -c plan_cache_mode={plan_cache_mode}"
+    return make_conninfo(
         host=host or None,
         user=user or None,
         password=password or None,
@@ -96,9 +211,53 @@ def connect(host='localhost', user='', password='', database_name='',
         port=int(port) if port else None,
         **kwargs
     )
-    conn.autocommit = to_bool(autocommit)
 
-    return Connection(connection=conn, database_name=database_name, real_as_double=real_as_double)
+
+def _get_pool(conninfo, pool_size, autocommit):
+    """Return the connection pool for the given connection info, creating it if necessary."""
+    key = (conninfo, autocommit)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            # A pool opens its connections in the background, where an unreachable host or a bad
+            # password only shows up as a timeout. Open one connection directly first, so the
+            # real error gets raised here.
+            psycopg.connect(conninfo).close()
+            # Connections get their autocommit mode when opened. Nothing changes it afterwards, so
+            # it need not be set again at every checkout.
+            # With psycopg_pool 3.2 or later, connections that sat idle in the pool get checked
+            # before being handed out, so one dropped by the server is replaced, not returned.
+            pool = ConnectionPool(conninfo, min_size=1, max_size=int(pool_size),
+                                  kwargs={'autocommit': autocommit}, configure=_configure,
+                                  open=True, **_POOL_CHECK)
+            _pools[key] = pool
+    return pool
+
+
+def _close_pools(conninfo):
+    """Close any pools holding connections made with the given connection info."""
+    with _pools_lock:
+        for key in [k for k in _pools if k[0] == conninfo]:
+            _pools.pop(key).close()
+
+
+@_pg_guard
+def connect(host='localhost', user='', password='', database_name='',
+            driver='', port=5432, autocommit=True, real_as_double=True, plan_cache_mode='',
+            pool_size=0, **kwargs):
+    """Connect to the specified PostgreSQL database."""
+    conninfo = _conninfo(host, user, password, database_name, port, plan_cache_mode, **kwargs)
+    autocommit = to_bool(autocommit)
+    if ConnectionPool is None or not int(pool_size):
+        pool = None
+        conn = psycopg.connect(conninfo, autocommit=autocommit)
+        _configure(conn)
+    else:
+        pool = _get_pool(conninfo, pool_size, autocommit)
+        conn = pool.getconn()
+
+    return Connection(connection=conn, database_name=database_name, real_as_double=real_as_double,
+                      pool=pool)
 
 
 @_pg_guard
@@ -109,46 +268,98 @@ def create(host='localhost', user='', password='', database_name='',
     # Open up a connection to the "maintenance" database (usually 'postgres'), then create the
     # new database:
     maint_db = kwargs.get('maintenance_db', 'postgres')
-    with psycopg.connect(host=host or None, user=user or None, password=password or None,
-                         dbname=maint_db or None, port=int(port) if port else None) as conn:
+    with psycopg.connect(_conninfo(host, user, password, maint_db, port, **kwargs)) as conn:
         conn.autocommit = True
-        conn.execute(f"CREATE DATABASE {database_name};")
-    # Now connect to the new database and create the metadata table:
-    with psycopg.connect(host=host or None, user=user or None, password=password or None,
-                         dbname=database_name) as conn:
-        conn.autocommit = True
-        conn.execute("CREATE TABLE weewx_db__metadata (table_name TEXT, column_name TEXT);")
+        conn.execute(sql.SQL("CREATE DATABASE {};").format(sql.Identifier(database_name)),
+                     prepare=False)
+    # Now connect to the new database and create the metadata table. If pooling is on, go
+    # through the same pool that connect() uses, so the connection opened here gets reused. The
+    # connection info, and so the pool, must be exactly what connect() would use.
+    conninfo = _conninfo(host, user, password, database_name, port, **kwargs)
+    pool_size = int(kwargs.get('pool_size', 0))
+    if ConnectionPool is None or not pool_size:
+        db_conn = psycopg.connect(conninfo, autocommit=True)
+    else:
+        pool = _get_pool(conninfo, pool_size, to_bool(kwargs.get('autocommit', True)))
+        db_conn = pool.connection()
+    with db_conn as conn:
+        # No index on this table: columnsOf() relies on getting the names back in the order they
+        # were inserted, and an index-only scan would return them sorted instead.
+        conn.execute("CREATE TABLE weewx_db__metadata (table_name TEXT, column_name TEXT);",
+                     prepare=False)
 
 
 @_pg_guard
 def drop(host='localhost', user='', password='', database_name='',
          driver='', port=5432, **kwargs):
     """Drop (delete) the specified database."""
+    # Pooled connections to the database would keep it from being dropped.
+    _close_pools(_conninfo(host, user, password, database_name, port, **kwargs))
     maint_db = kwargs.get('maintenance_db', 'postgres')
-    with psycopg.connect(host=host or None, user=user or None, password=password or None,
-                         dbname=maint_db, port=int(port) if port else None) as conn:
+    with psycopg.connect(_conninfo(host, user, password, maint_db, port, **kwargs)) as conn:
         conn.autocommit = True
-        conn.execute(f"DROP DATABASE {database_name}")
+        conn.execute(sql.SQL("DROP DATABASE {};").format(sql.Identifier(database_name)),
+                     prepare=False)
+
+
+@functools.lru_cache(maxsize=None)
+def _column_type(pg_type):
+    """Map a type, as returned by PostgreSQL function format_type(), to a weedb column type."""
+    dtype = _TYPMOD_RE.sub('', pg_type).upper()
+    coltype = _COLUMN_TYPES.get(dtype)
+    if coltype is None:
+        if 'INT' in dtype:
+            coltype = 'INTEGER'
+        elif 'CHAR' in dtype:
+            coltype = 'STR'
+        else:
+            coltype = dtype
+    return coltype
+
+
+@functools.lru_cache(maxsize=512)
+def _translate(sql_string):
+    """Translate weedb '?' placeholders into psycopg '%s' placeholders."""
+    return sql_string.replace('?', '%s')
 
 
 class Connection(weedb.Connection):
     """A wrapper around a psycopg connection object."""
 
-    def __init__(self, connection, database_name='', real_as_double=True):
+    def __init__(self, connection, database_name='', real_as_double=True, pool=None):
         super().__init__(connection, database_name, 'postgresql')
         self.real_as_double = to_bool(real_as_double)
+        self.pool = pool
+        # Cache of column names, keyed by table name, and of the list of tables. The DDL methods
+        # of Cursor keep them current.
+        self._columns_cache = {}
+        self._tables_cache = None
+        # Cache of server variables returned by get_variable(), keyed by variable name
+        self._variable_cache = {}
+        # The psycopg Transaction opened by begin(), if any
+        self._transaction = None
 
     def cursor(self):
         """Return a cursor object."""
         return Cursor(self)
 
+    def _invalidate(self, table=None):
+        """Forget the cached schema information for the given table. If no table is given,
+        forget it for all tables."""
+        if table is None:
+            self._columns_cache.clear()
+        else:
+            self._columns_cache.pop(table, None)
+        self._tables_cache = None
+
     @_pg_guard
     def tables(self):
         """Returns a list of tables in the database. This version retrieves mixed-case
         table names from metadata"""
-        with self.connection.cursor() as cur:
-            results = cur.execute("SELECT DISTINCT table_name FROM weewx_db__metadata").fetchall()
-        return [row[0] for row in results]
+        if self._tables_cache is None:
+            results = self.connection.execute(_SQL_SELECT_TABLES, prepare=True).fetchall()
+            self._tables_cache = [row[0] for row in results]
+        return list(self._tables_cache)
 
     @_pg_guard
     def list_tables(self):
@@ -156,21 +367,19 @@ class Connection(weedb.Connection):
          does not use metadata. This is an extension to the regular weedb API
          that could potentially be useful."""
 
-        table_list = []
         with self.connection.cursor() as cur:
-            cur.execute(
+            # Query pg_class directly, rather than through the pg_tables view. Like pg_tables,
+            # include both ordinary ('r') and partitioned ('p') tables.
+            results = cur.execute(
                 """
-                SELECT tablename
-                FROM pg_catalog.pg_tables
-                WHERE schemaname NOT IN ('pg_catalog', 'information_schema');
+                SELECT c.relname
+                FROM pg_class c
+                         JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE c.relkind IN ('r', 'p')
+                  AND n.nspname NOT IN ('pg_catalog', 'information_schema');
                 """
-            )
-            while True:
-                row = cur.fetchone()
-                if row is None:
-                    break
-                table_list.append(str(row[0]))
-        return table_list
+            ).fetchall()
+        return [row[0] for row in results]
 
     @_pg_guard
     def genSchemaOf(self, table):
@@ -178,82 +387,70 @@ class Connection(weedb.Connection):
 
         Returns (i, column_name, column_type, can_be_null, default_value, is_primary)
         """
-        # Build a set of primary key columns
-        pk_cols = set()
         with self.connection.cursor() as cur:
+            cur.arraysize = _ARRAYSIZE
+            # Read the catalog directly, rather than through the much slower information_schema
+            # views. The join against pg_index tags the primary key columns in the same query.
+            # Function to_regclass() resolves the table name the same way an unquoted name in SQL
+            # would be, folding it to lower case and searching the schemas on the search path.
             cur.execute(
                 """
-                SELECT a.attname
-                FROM pg_index i
-                         JOIN pg_attribute a
-                              ON a.attrelid = i.indrelid AND a.attnum = ANY (i.indkey)
-                         JOIN pg_class c ON c.oid = i.indrelid
-                WHERE i.indisprimary = TRUE
-                  AND c.relname = %s;
-                """,
-                (table,)
-            )
-            for r in cur:
-                pk_cols.add(str(r[0]))
-
-        with self.connection.cursor() as cur:
-            cur.execute(
-                """
-                SELECT column_name, data_type, is_nullable, column_default
-                FROM information_schema.columns
-                WHERE table_name = %s
-                ORDER BY ordinal_position;
+                SELECT a.attname,
+                       format_type(a.atttypid, a.atttypmod),
+                       NOT a.attnotnull,
+                       pg_get_expr(ad.adbin, ad.adrelid),
+                       COALESCE(a.attnum = ANY (i.indkey), FALSE)
+                FROM pg_attribute a
+                         LEFT JOIN pg_attrdef ad ON ad.adrelid = a.attrelid AND ad.adnum = a.attnum
+                         LEFT JOIN pg_index i ON i.indrelid = a.attrelid AND i.indisprimary
+                WHERE a.attrelid = to_regclass(%s)
+                  AND a.attnum > 0
+                  AND NOT a.attisdropped
+                ORDER BY a.attnum;
                 """,
                 (table,)
             )
+            column_type = _column_type
             i = 0
             while True:
-                row = cur.fetchone()
-                if row is None:
+                rows = cur.fetchmany(_ARRAYSIZE)
+                if not rows:
                     break
-                colname = str(row[0])
-                dtype = str(row[1]).upper()
-                if dtype in ('DOUBLE PRECISION', 'REAL', 'NUMERIC', 'DECIMAL'):
-                    coltype = 'REAL'
-                elif 'INT' in dtype:
-                    coltype = 'INTEGER'
-                elif 'CHAR' in dtype or dtype == 'TEXT' or 'CHARACTER' in dtype:
-                    coltype = 'STR'
-                else:
-                    coltype = dtype
-                can_be_null = True if (str(row[2]).upper() == 'YES') else False
-                default_val = row[3]
-                is_primary = colname in pk_cols
-                yield (i, colname, coltype, can_be_null, default_val, is_primary)
-                i += 1
+                for colname, pg_type, can_be_null, default_val, is_primary in rows:
+                    yield (i, colname, column_type(pg_type), can_be_null, default_val, is_primary)
+                    i += 1
 
     @_pg_guard
     def columnsOf(self, table):
         """Return a list of column names for the given table. We actually retrive the list
         from a separate metadata table. This insures that the column names reflect the original
         mixed-case names."""
-        column_list = []
+        if table in self._columns_cache:
+            return list(self._columns_cache[table])
         with self.connection.cursor() as cur:
-            for column_name in cur.execute("SELECT column_name "
-                                           "FROM weewx_db__metadata "
-                                           "WHERE table_name = %s;", (table,)):
-                column_list.append(column_name[0])
+            cur.execute(_SQL_SELECT_COLUMNS, (table,), prepare=True)
+            column_list = [row[0] for row in cur.fetchall()]
         # If the list is empty, that means the table doesn't exist. Raise an exception.
         if not column_list:
             raise weedb.NoTableError(f'Table {table} does not exist.')
 
-        return column_list
+        self._columns_cache[table] = column_list
+        return list(column_list)
 
     @_pg_guard
     def get_variable(self, var_name):
-        # PostgreSQL has SHOW for some variables
-        with self.connection.cursor() as cur:
-            try:
-                cur.execute(f"SHOW {var_name};")
-            except PGDatabaseError:
-                return None
-            row = cur.fetchone()
-            return None if row is None else (var_name, row[0])
+        # PostgreSQL has SHOW for some variables. Their values rarely change during a session, so
+        # remember them.
+        if var_name in self._variable_cache:
+            return self._variable_cache[var_name]
+        try:
+            row = self.connection.execute(sql.SQL("SHOW {};").format(sql.Identifier(var_name)),
+                                          prepare=False).fetchone()
+        except PGDatabaseError:
+            return None
+        result = None if row is None else (var_name, row[0])
+        self._variable_cache[var_name] = result
+        return result
 
     group_defs = {
         #        'day': "GROUP BY date_trunc('day', to_timestamp(dateTime)) ",
@@ -270,22 +467,93 @@ class Connection(weedb.Connection):
         # Fail hard if we're given a bad group name:
         return Connection.group_defs[group_name]
 
+    @contextlib.contextmanager
+    def pipeline(self):
+        """Context manager that runs the statements executed inside it in pipeline mode. Rather
+        than waiting for each result, psycopg sends the statements to the server back-to-back,
+        then collects the results on exit. A batch of writes, such as archive inserts, then costs
+        about one round-trip, instead of one per statement.
+
+        A fetch inside the block still works, but it has to wait until everything queued before
+        it has been processed by the server.
+
+        If the libpq in use does not support pipeline mode, the statements are simply executed
+        one at a time."""
+        with _pg_errors:
+            if psycopg.Pipeline.is_supported():
+                with self.connection.pipeline():
+                    yield self
+            else:
+                yield self
+
+    def batch_execute(self, statements):
+        """Execute a sequence of (sql_string, sql_tuple) pairs in a single pipeline."""
+        with self.cursor() as cursor, self.pipeline():
+            for sql_string, sql_tuple in statements:
+                cursor.execute(sql_string, sql_tuple)
+
+    def stream(self, sql_string, sql_tuple=(), chunk=_ITERSIZE):
+        """Generator that yields the rows of a query, fetching them chunk rows at a time through
+        a server-side cursor. Memory use stays the same, however large the result.
+
+        Run it between begin() and commit(), or inside transaction(). Otherwise, in autocommit
+        mode, the cursor has to be declared WITH HOLD, and the server then computes the entire
+        result before the first row arrives."""
+        with self.cursor() as cursor:
+            cursor.execute_server(sql_string, sql_tuple, itersize=chunk)
+            yield from cursor
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Context manager that runs the statements executed inside it as one transaction. The
+        transaction is committed on exit, or rolled back if the block raises an exception."""
+        with _pg_errors:
+            with self.connection.transaction():
+                yield self
+
     @_pg_guard
     def begin(self):
-        try:
-            self.connection.autocommit = False
-        except Exception:
-            pass
-        with self.connection.cursor() as cur:
-            cur.execute("BEGIN")
+        # Let a psycopg Transaction object issue the BEGIN. Unlike turning off autocommit, this
+        # leaves the connection's autocommit setting alone.
+        self._transaction = self.connection.transaction()
+        self._transaction.__enter__()
 
     @_pg_guard
     def commit(self):
-        self.connection.commit()
+        transaction, self._transaction = self._transaction, None
+        if transaction is not None:
+            transaction.__exit__(None, None, None)
+        if not self.connection.autocommit:
+            self.connection.commit()
 
     @_pg_guard
     def rollback(self):
-        self.connection.rollback()
+        # The rollback may undo schema changes, so the cached schema information cannot be trusted
+        self._invalidate()
+        transaction, self._transaction = self._transaction, None
+        if transaction is not None:
+            # This is how a psycopg Transaction is told to roll back without raising an error
+            transaction.__exit__(psycopg.Rollback, psycopg.Rollback(), None)
+        if not self.connection.autocommit:
+            self.connection.rollback()
+
+    def close(self):
+        """Close the connection. If it came from a pool, return it to the pool instead."""
+        if self.pool is None:
+            super().close()
+        elif self.connection is not None:
+            # Roll back anything left open. Otherwise, the pool would do it, and log a warning.
+            if self.connection.info.transaction_status != TransactionStatus.IDLE:
+                with contextlib.suppress(weedb.DatabaseError):
+                    self.rollback()
+            self.pool.putconn(self.connection)
+            self.connection = None
+
+    def __del__(self):
+        # A pooled connection that is never closed would otherwise never go back to its pool,
+        # and the pool would run out of connections.
+        if getattr(self, 'pool', None) is not None:
+            self.close()
 
     @property
     def has_math(self):
@@ -300,22 +568,92 @@ class Cursor(weedb.Cursor):
     def __init__(self, connection):
         # This will be a psycopg cursor object
         self._cursor = connection.connection.cursor()
+        self._conn = connection
         self.real_as_double = connection.real_as_double
+        # Iterator over the results of a server-side cursor. None when using a client-side cursor.
+        self._rows = None
+
+    def _use_client_cursor(self):
+        """If the last query went through a server-side cursor, go back to a client-side one."""
+        if self._rows is not None:
+            # Swap in the new cursor before closing the old one, so that a failure to close it
+            # does not leave this cursor stuck on the server-side cursor.
+            cursor, self._cursor = self._cursor, self._conn.connection.cursor()
+            self._rows = None
+            cursor.close()
+
+    def _declare(self, name, pg_string, sql_tuple, itersize, binary):
+        """Replace the current psycopg cursor with a server-side cursor, and run the query on
+        it."""
+        connection = self._conn.connection
+        # In autocommit mode, outside a transaction opened by begin() or transaction(), a
+        # server-side cursor only survives if declared WITH HOLD. Inside one, it need not be, which
+        # saves the server from computing the rest of the result when the transaction commits.
+        withhold = (connection.autocommit
+                    and connection.info.transaction_status == TransactionStatus.IDLE)
+        cursor, self._cursor = self._cursor, connection.cursor(name=name, binary=binary,
+                                                               withhold=withhold)
+        # Mark the cursor as server-side right away. If the query fails, the next execute() then
+        # still goes back to a client-side cursor.
+        self._rows = iter(())
+        cursor.close()
+        self._cursor.itersize = itersize
+        self._cursor.execute(pg_string, sql_tuple)
+
+    def execute(self, sql_string, sql_tuple=(), prepare=None):
+        # pyscopg uses %s placeholders: replace '?' with '%s'. Many statements have none, and can
+        # be used as-is.
+        pg_string = _translate(sql_string) if '?' in sql_string else sql_string
+        if not isinstance(sql_tuple, tuple):
+            sql_tuple = tuple(sql_tuple)
+        # This is the hottest path in the driver, so translate exceptions here, rather than
+        # through the extra call made by _pg_guard.
+        with _pg_errors:
+            self._use_client_cursor()
+            self._cursor.execute(pg_string, sql_tuple, prepare=prepare)
+        return self
+
+    @_pg_guard
+    def executemany(self, sql_string, seq_of_params):
+        """Execute the same statement once for each set of parameters. psycopg sends all of them
+        together, rather than making a round-trip per set."""
+        self._use_client_cursor()
+        self._cursor.executemany(_translate(sql_string), seq_of_params)
+        return self
 
     @_pg_guard
-    def execute(self, sql_string, sql_tuple=()):
-        # pyscopg uses %s placeholders: replace '?' with '%s'.
-        pg_string = sql_string.replace('?', '%s')
-        self._cursor.execute(pg_string, tuple(sql_tuple))
+    def execute_server(self, sql_string, sql_tuple=(), name=None, itersize=_ITERSIZE):
+        """Like execute(), but run the query through a named, server-side cursor. The results
+        are then fetched in batches of itersize rows, rather than all at once. Useful for queries
+        that scan a large part of the archive.
+
+        The results are asked for in binary format, which is cheaper to decode than text for the
+        numbers that make up archive rows. If a column has a type psycopg cannot load from binary,
+        the query is declared again with results in text format."""
+        name = name or f"wx_{id(self)}"
+        pg_string = _translate(sql_string)
+        sql_tuple = tuple(sql_tuple)
+        self._declare(name, pg_string, sql_tuple, itersize, binary=True)
+        get_loader = self._cursor.adapters.get_loader
+        if not all(get_loader(column.type_code, Format.BINARY)
+                   for column in self._cursor.description or ()):
+            # Otherwise, such a column would come back as raw bytes.
+            self._declare(name, pg_string, sql_tuple, itersize, binary=False)
+        # Iterating a server-side cursor fetches itersize rows at a time, while its fetchone()
+        # makes a round-trip for every row. So, have fetchone() draw from the iterator.
+        self._rows = iter(self._cursor)
         return self
 
     @property
     def rowcount(self):
         return getattr(self._cursor, 'rowcount', -1)
 
-    @_pg_guard
     def fetchone(self):
-        return self._cursor.fetchone()
+        # Called for every row, so translate exceptions here, like execute() does.
+        with _pg_errors:
+            if self._rows is not None:
+                return next(self._rows, None)
+            return self._cursor.fetchone()
 
     def create_table(self, table_name, schema):
         """Create a new table with the specified schema.
@@ -333,38 +671,38 @@ class Cursor(weedb.Cursor):
             final_schema = schema
         # Have my superclass create the table
         super().create_table(table_name, final_schema)
+        self._conn._invalidate(table_name)
 
-        # Now insert the original mixed-case table and column names into the metadata table
-        for column_name, _ in final_schema:
-            self.execute("INSERT INTO weewx_db__metadata (table_name, column_name) "
-                         "VALUES (%s, %s);",
-                         (table_name, column_name))
+        # Now insert the original mixed-case table and column names into the metadata table. Send
+        # all rows in one batch rather than one round-trip per column.
+        self.executemany(_SQL_INSERT_COLUMN,
+                         [(table_name, column_name) for column_name, _ in final_schema])
 
     def drop_table(self, table_name):
         """Drop an existing table. Specialized to handle metadata cleanup."""
         # Have my superclass drop the table
         super().drop_table(table_name)
+        self._conn._invalidate(table_name)
         # Then delete the metadata
-        self.execute("DELETE FROM weewx_db__metadata WHERE table_name = %s;", (table_name,))
+        self.execute(_SQL_DELETE_TABLE, (table_name,), prepare=True)
 
     def add_column(self, table_name, column_name, column_type):
         """Add a single new column to an existing table."""
 
         # Have my superclass add the column to the table
         super().add_column(table_name, column_name, column_type)
+        self._conn._invalidate(table_name)
         # Then add it to the metadata table
-        self.execute("INSERT INTO weewx_db__metadata (table_name, column_name) "
-                     "VALUES (%s, %s);",
-                     (table_name, column_name))
+        self.execute(_SQL_INSERT_COLUMN, (table_name, column_name), prepare=True)
 
     def rename_column(self, table_name, old_column_name, new_column_name):
         """Rename a column in the main archive table."""
         # Have my superclass rename the column in the main table
         super().rename_column(table_name, old_column_name, new_column_name)
+        self._conn._invalidate(table_name)
         # Then update the metadata table
-        self.execute("UPDATE weewx_db__metadata SET column_name = %s "
-                     "WHERE table_name = %s AND column_name = %s;",
-                     (new_column_name, table_name, old_column_name))
+        self.execute(_SQL_RENAME_COLUMN, (new_column_name, table_name, old_column_name),
+                     prepare=True)
 
     def drop_columns(self, table, column_names):
         """Drop one or more columns from an existing table.
@@ -374,17 +712,17 @@ class Cursor(weedb.Cursor):
         if not column_names:
             return
 
-        # First drop the columns from the main table
-        sql_stmt = f'ALTER TABLE {table} DROP COLUMN ' + ', DROP COLUMN '.join(column_names)
-        self.execute(sql_stmt)
-
-        # Now delete the metadata. Create a string like "%s, %s" based on the length of column_names
-        placeholders = ', '.join(['%s'] * len(column_names))
-        sql_stmt = (f"DELETE FROM weewx_db__metadata "
-                    f"WHERE table_name = %s AND column_name IN ({placeholders});")
-
-        # Pass the table name followed by all the column names
-        self.execute(sql_stmt, (table, *column_names))
+        alter_stmt = f'ALTER TABLE {table} DROP COLUMN ' + ', DROP COLUMN '.join(column_names)
+
+        # Send both statements in one pipeline, rather than waiting on the first before sending
+        # the second.
+        with self._conn.pipeline():
+            # First drop the columns from the main table
+            self.execute(alter_stmt, prepare=False)
+            # Then delete the metadata. The column names are passed as a single array, so the
+            # statement text is the same however many columns there are.
+            self.execute(_SQL_DELETE_COLUMNS, (table, list(column_names)), prepare=True)
+        self._conn._invalidate(table)
 
     def close(self):
         try:
@@ -36,6 +36,9 @@ CONFIG = """
         password = weewx
         # If True, use DOUBLE PRECISION for REAL columns.
         real_as_double = true
+        # Set to more than 0 to keep a pool of up to this many connections. Requires the
+        # package psycopg_pool.
+        pool_size = 0
 """
 
 postgresql_dict = configobj.ConfigObj(StringIO(CONFIG))
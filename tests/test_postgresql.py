@@ -0,0 +1,157 @@
+#
+#    Copyright (c) 2009-2026 Tom Keffer <tkeffer@gmail.com>
+#
+#    See the file LICENSE.txt for your full rights.
+#
+"""Test the extensions made by the PostgreSQL driver to the weedb API.
+
+User weewx1 should be created in the PostgreSQL database with password "weewx1". The script
+"setup_psql.sh" will set it up with the necessary permissions.
+
+If the PostgreSQL server is on a remote host, the environmental variable PGHOST
+should be set to the host name. Otherwise, the host name is assumed to be "localhost".
+"""
+import unittest
+import weedb
+from user import postgresql
+
+psql_dict = {'host': None, 'database_name': 'test_weewx1', 'user': 'weewx1', 'password': 'weewx1', 'driver': 'user.postgresql'}
+
+schema = [('dateTime', 'INTEGER NOT NULL PRIMARY KEY'), ('outTemp', 'REAL'), ('inTemp', 'REAL')]
+
+
+class Tester(unittest.TestCase):
+
+    def setUp(self):
+        """Start each test with a fresh database, holding a single table."""
+        try:
+            weedb.drop(psql_dict)
+        except weedb.NoDatabase:
+            pass
+        weedb.create(psql_dict)
+        self.connect = weedb.connect(psql_dict)
+        with self.connect.cursor() as cursor:
+            cursor.create_table('test1', schema)
+
+    def tearDown(self):
+        self.connect.close()
+
+    def test_schema_cache(self):
+        self.assertEqual(self.connect.columnsOf('test1'), ['dateTime', 'outTemp', 'inTemp'])
+        with self.connect.cursor() as cursor:
+            cursor.add_column('test1', 'barometer', 'REAL')
+        self.assertEqual(self.connect.columnsOf('test1'),
+                         ['dateTime', 'outTemp', 'inTemp', 'barometer'])
+        with self.connect.cursor() as cursor:
+            cursor.drop_columns('test1', ['outTemp', 'inTemp'])
+        self.assertEqual(self.connect.columnsOf('test1'), ['dateTime', 'barometer'])
+        self.assertEqual(self.connect.tables(), ['test1'])
+        with self.connect.cursor() as cursor:
+            cursor.drop_table('test1')
+        with self.assertRaises(weedb.NoTableError):
+            self.connect.columnsOf('test1')
+        self.assertEqual(self.connect.tables(), [])
+
+    def test_columns_order(self):
+        with self.connect.cursor() as cursor:
+            cursor.create_table('test2', [('zeta', 'REAL'), ('alpha', 'REAL'), ('Mid', 'REAL')])
+            # Once statistics exist, the planner is free to choose another plan for columnsOf()
+            cursor.execute("ANALYZE weewx_db__metadata")
+        # Use a fresh connection, so the names are not served from the schema cache
+        connect = weedb.connect(psql_dict)
+        self.assertEqual(connect.columnsOf('test1'), ['dateTime', 'outTemp', 'inTemp'])
+        self.assertEqual(connect.columnsOf('test2'), ['zeta', 'alpha', 'Mid'])
+        connect.close()
+
+    @unittest.skipIf(postgresql.ConnectionPool is None, "psycopg_pool is not installed")
+    def test_pool(self):
+        psql_dict_pool = dict(psql_dict, pool_size=2)
+        for i in range(3):
+            # Each connection is dropped without being closed, and must still go back to the pool
+            connect = weedb.connect(psql_dict_pool)
+            self.assertEqual(connect.columnsOf('test1'), ['dateTime', 'outTemp', 'inTemp'])
+        # A transaction left open gets rolled back when the connection is returned
+        connect.begin()
+        with connect.cursor() as cursor:
+            cursor.execute("INSERT INTO test1 (dateTime) VALUES (?)", (1,))
+        connect.close()
+        connect = weedb.connect(psql_dict_pool)
+        with connect.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM test1")
+            self.assertEqual(cursor.fetchone(), (0,))
+        connect.close()
+
+    @unittest.skipIf(postgresql.ConnectionPool is None, "psycopg_pool is not installed")
+    def test_create_pool(self):
+        psql_dict_pool = dict(psql_dict, pool_size=2, plan_cache_mode='force_generic_plan')
+        # Start over, creating the database with pooling on
+        self.connect.close()
+        weedb.drop(psql_dict_pool)
+        weedb.create(psql_dict_pool)
+        npools = len(postgresql._pools)
+        # connect() should get its connection from the pool made by create()
+        connect = weedb.connect(psql_dict_pool)
+        self.assertEqual(len(postgresql._pools), npools)
+        self.assertEqual(connect.get_variable('plan_cache_mode'),
+                         ('plan_cache_mode', 'force_generic_plan'))
+        connect.close()
+
+    def test_execute_server(self):
+        with self.connect.cursor() as cursor:
+            for i in range(2500):
+                cursor.execute("INSERT INTO test1 (dateTime, outTemp) VALUES (?, ?)", (i, i / 2))
+            cursor.execute_server("SELECT dateTime, outTemp FROM test1 WHERE dateTime >= ? "
+                                  "ORDER BY dateTime", (10,))
+            self.assertEqual(cursor.fetchone(), (10, 5.0))
+            self.assertEqual(len(list(cursor)), 2489)
+            # An ordinary execute() goes back to a client-side cursor
+            cursor.execute("SELECT COUNT(*) FROM test1")
+            self.assertEqual(cursor.fetchone(), (2500,))
+
+    def test_execute_server_text_fallback(self):
+        with self.connect.cursor() as cursor:
+            # psycopg has no binary loader for type point, so it must come back as text
+            cursor.execute_server("SELECT point(1, 2), 1.5::REAL")
+            self.assertEqual(cursor.fetchone(), ('(1,2)', 1.5))
+
+    def test_execute_server_error(self):
+        with self.connect.cursor() as cursor:
+            with self.assertRaises(weedb.NoTableError):
+                cursor.execute_server("SELECT * FROM no_such_table")
+            # The same cursor must still work afterwards
+            cursor.execute("SELECT COUNT(*) FROM test1")
+            self.assertEqual(cursor.fetchone(), (0,))
+
+    def test_execute_server_holdable(self):
+        with self.connect.cursor() as cursor, self.connect.cursor() as check:
+            cursor.execute_server("SELECT dateTime FROM test1", name='wx_hold')
+            check.execute("SELECT is_holdable FROM pg_cursors WHERE name = 'wx_hold'")
+            self.assertEqual(check.fetchone(), (True,))
+            # Inside a transaction, the cursor need not be declared WITH HOLD
+            self.connect.begin()
+            cursor.execute_server("SELECT dateTime FROM test1", name='wx_nohold')
+            check.execute("SELECT is_holdable FROM pg_cursors WHERE name = 'wx_nohold'")
+            self.assertEqual(check.fetchone(), (False,))
+            self.connect.commit()
+
+    def test_stream(self):
+        self.connect.batch_execute([("INSERT INTO test1 (dateTime) VALUES (?)", (i,))
+                                    for i in range(25)])
+        self.connect.begin()
+        rows = list(self.connect.stream("SELECT dateTime FROM test1 ORDER BY dateTime", chunk=10))
+        self.connect.commit()
+        self.assertEqual(rows, [(i,) for i in range(25)])
+
+    def test_batch_execute(self):
+        self.connect.batch_execute([("INSERT INTO test1 (dateTime, outTemp) VALUES (?, ?)", (i, i))
+                                    for i in range(10)])
+        with self.connect.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*), SUM(outTemp) FROM test1")
+            self.assertEqual(cursor.fetchone(), (10, 45.0))
+        # An error raised in the pipeline should still map to a weedb exception
+        with self.assertRaises(weedb.IntegrityError):
+            self.connect.batch_execute([("INSERT INTO test1 (dateTime) VALUES (?)", (0,))])
+
+
+if __name__ == '__main__':
+    unittest.main()